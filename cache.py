@@ -0,0 +1,90 @@
+import logging
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class NewsCache:
+    DEFAULT_TTL = 90
+    MAX_LOCAL_ENTRIES = 1024
+
+    def __init__(self, redis_url: Optional[str] = None, ttl: int = DEFAULT_TTL):
+        self.redis_url = redis_url or os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+        self.ttl = ttl
+        self._redis = None
+        self._local: Dict[str, Tuple[float, bytes]] = {}
+
+    async def connect(self):
+        if aioredis is None:
+            logger.info("redis package not installed, using in-memory cache")
+            return
+        try:
+            self._redis = aioredis.from_url(self.redis_url)
+            await self._redis.ping()
+            logger.info("Connected to Redis cache")
+        except Exception as e:
+            logger.warning(f"Redis unavailable ({e}), falling back to in-memory cache")
+            self._redis = None
+
+    async def disconnect(self):
+        if self._redis:
+            await self._redis.aclose()
+            self._redis = None
+        self._local.clear()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if self._redis:
+            try:
+                return await self._redis.get(key)
+            except Exception as e:
+                logger.warning(f"Redis GET failed ({e}), falling back to in-memory cache")
+                self._redis = None
+
+        entry = self._local.get(key)
+        if entry:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                return value
+            self._local.pop(key, None)
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None):
+        ttl = ttl or self.ttl
+        if self._redis:
+            try:
+                await self._redis.setex(key, ttl, value)
+                return
+            except Exception as e:
+                logger.warning(f"Redis SETEX failed ({e}), falling back to in-memory cache")
+                self._redis = None
+
+        now = time.monotonic()
+        if len(self._local) >= self.MAX_LOCAL_ENTRIES:
+            for stale in [k for k, (expires_at, _) in self._local.items() if expires_at <= now]:
+                self._local.pop(stale, None)
+            while len(self._local) >= self.MAX_LOCAL_ENTRIES:
+                self._local.pop(next(iter(self._local)), None)
+
+        self._local[key] = (now + ttl, value)
+
+    async def invalidate(self, pattern: str = "news:*"):
+        if self._redis:
+            try:
+                async for key in self._redis.scan_iter(pattern):
+                    await self._redis.delete(key)
+                return
+            except Exception as e:
+                logger.warning(f"Redis invalidation failed ({e}): {pattern}")
+                self._redis = None
+
+        prefix = pattern.rstrip('*')
+        for key in [k for k in self._local if k.startswith(prefix)]:
+            self._local.pop(key, None)
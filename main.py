@@ -1,12 +1,18 @@
+import hashlib
 import logging
-from datetime import datetime
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, Field
 
+from cache import NewsCache
 from scapper import AsyncNewsAPI, NewsConfig
 
 logging.basicConfig(level=logging.INFO)
@@ -44,12 +50,57 @@ class HealthResponse(BaseModel):
     uptime: Optional[str] = None
 
 
+app_start_time = datetime.now(timezone.utc)
+cache = NewsCache()
+
+AVAILABLE_CATEGORIES = [
+    "all",
+    "business",
+    "sports",
+    "technology",
+    "entertainment",
+    "science",
+    "politics",
+    "world"
+]
+
+API_FEATURES = {
+    "async_support": True,
+    "concurrent_requests": True,
+    "multiple_categories": True,
+    "search_support": True,
+    "rate_limiting": False
+}
+
+API_LIMITS = {
+    "max_articles_per_request": 100,
+    "max_categories_per_request": 10,
+    "concurrent_request_limit": NewsConfig.MAX_CONCURRENT_REQUESTS
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.news = AsyncNewsAPI()
+    await app.state.news.__aenter__()
+    await cache.connect()
+    logger.info("Inshort News API started successfully")
+    try:
+        yield
+    finally:
+        await app.state.news.__aexit__(None, None, None)
+        await cache.disconnect()
+        logger.info("Inshort News API shut down")
+
+
 app = FastAPI(
     title="Inshorts News API",
     description="Async FastAPI wrapper for Inshorts news fetching with enhanced performance",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -60,33 +111,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app_start_time = datetime.utcnow()
-news_api_instance = None
 
+_ts_cache = [0, ""]
 
-@app.on_event("startup")
-async def startup_event():
-    global news_api_instance
-    news_api_instance = AsyncNewsAPI()
-    await news_api_instance.__aenter__()
-    logger.info("Inshort News API started successfully")
 
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    global news_api_instance
-    if news_api_instance:
-        await news_api_instance.__aexit__(None, None, None)
-    logger.info("Inshort News API shut down")
+def get_current_timestamp() -> str:
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(now))
+    return _ts_cache[1]
 
 
-def get_current_timestamp() -> str:
-    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+def strip_private_fields(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{k: v for k, v in article.items() if not k.startswith('_')}
+            for article in articles]
 
 
 @app.get("/", response_model=HealthResponse)
 async def root():
-    uptime = str(datetime.utcnow() - app_start_time)
+    uptime = str(datetime.now(timezone.utc) - app_start_time)
     return HealthResponse(
         status="active",
         timestamp=get_current_timestamp(),
@@ -96,7 +140,7 @@ async def root():
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    uptime = str(datetime.utcnow() - app_start_time)
+    uptime = str(datetime.now(timezone.utc) - app_start_time)
     return HealthResponse(
         status="healthy",
         timestamp=get_current_timestamp(),
@@ -106,50 +150,53 @@ async def health_check():
 
 @app.get("/categories")
 async def get_categories():
-    categories = {
-        "available_categories": [
-            "all",
-            "business",
-            "sports",
-            "technology",
-            "entertainment",
-            "science",
-            "politics",
-            "world"
-        ],
+    return {
+        "available_categories": AVAILABLE_CATEGORIES,
         "timestamp": get_current_timestamp()
     }
-    return categories
 
 
-@app.get("/news/{category}", response_model=NewsResponse)
-async def get_news_by_category(
-        category: str,
-        max_limit: int = Query(default=10, ge=1, le=100, description="Maximum number of articles (1-100)")
-):
+NEWS_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=120"
+
+
+async def _fetch_and_wrap(request: Request, category: str, max_limit: int):
     try:
         if max_limit < 1 or max_limit > 100:
             raise HTTPException(status_code=400, detail="max_limit must be between 1 and 100")
 
-        logger.info(f"Fetching news for category: {category}, limit: {max_limit}")
+        cache_key = f"news:{category}:{max_limit}"
+        payload = await cache.get(cache_key)
 
-        news_data = await news_api_instance.get_news(category, max_limit)
+        if payload is None:
+            logger.info(f"Fetching news for category: {category}, limit: {max_limit}")
 
-        if not news_data['success']:
-            raise HTTPException(status_code=400, detail=news_data.get('error', 'Unknown error'))
+            news_data = await request.app.state.news.get_news(category, max_limit)
 
-        limited_data = news_data['data'][:max_limit]
+            if not news_data['success']:
+                raise HTTPException(status_code=400, detail=news_data.get('error', 'Unknown error'))
 
-        response = NewsResponse(
-            success=news_data['success'],
-            category=news_data['category'],
-            data=limited_data,
-            error=news_data.get('error'),
-            total_articles=len(limited_data),
-            timestamp=get_current_timestamp()
-        )
+            limited_data = strip_private_fields(news_data['data'])
 
-        return response
+            payload = orjson.dumps({
+                "success": news_data['success'],
+                "category": news_data['category'],
+                "data": limited_data,
+                "error": news_data.get('error'),
+                "total_articles": len(limited_data),
+                "timestamp": get_current_timestamp()
+            })
+            await cache.set(cache_key, payload)
+
+        etag = f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": NEWS_CACHE_CONTROL}
+
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            if '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags):
+                return Response(status_code=304, headers=headers)
+
+        return Response(content=payload, media_type="application/json", headers=headers)
 
     except HTTPException:
         raise
@@ -161,8 +208,18 @@ async def get_news_by_category(
         )
 
 
-@app.get("/news/multiple")
+@app.get("/news/{category}", responses={200: {"model": NewsResponse}})
+async def get_news_by_category(
+        request: Request,
+        category: str,
+        max_limit: int = Query(default=10, ge=1, le=100, description="Maximum number of articles (1-100)")
+):
+    return await _fetch_and_wrap(request, category, max_limit)
+
+
+@app.get("/news/multiple", responses={200: {"model": MultiCategoryResponse}})
 async def get_multiple_categories_news(
+        request: Request,
         categories: str = Query(..., description="Comma-separated list of categories"),
         max_limit: int = Query(default=10, ge=1, le=50, description="Maximum articles per category (1-50)")
 ):
@@ -178,22 +235,36 @@ async def get_multiple_categories_news(
         if not category_list:
             raise HTTPException(status_code=400, detail="At least one category must be provided")
 
-        logger.info(f"Fetching news for categories: {category_list}, limit: {max_limit}")
-
-        news_data = await news_api_instance.get_multiple_categories(category_list, max_limit)
+        news_data = {}
+        missing = []
+        for category in category_list:
+            raw = await cache.get(f"newsraw:{category}:{max_limit}")
+            if raw is not None:
+                news_data[category] = orjson.loads(raw)
+            else:
+                missing.append(category)
+
+        if missing:
+            logger.info(f"Fetching news for categories: {missing}, limit: {max_limit}")
+            fetched = await request.app.state.news.get_multiple_categories(missing, max_limit)
+            for category, data in fetched.items():
+                if data.get('success'):
+                    await cache.set(f"newsraw:{category}:{max_limit}", orjson.dumps(data))
+                news_data[category] = data
 
         for category, data in news_data.items():
             if data['success'] and 'data' in data:
-                data['data'] = data['data'][:max_limit]
-
-        response = MultiCategoryResponse(
-            success=True,
-            categories=news_data,
-            timestamp=get_current_timestamp(),
-            total_categories=len(news_data)
-        )
-
-        return response
+                articles = data['data']
+                if len(articles) > max_limit:
+                    articles = articles[:max_limit]
+                news_data[category] = {**data, 'data': strip_private_fields(articles)}
+
+        return ORJSONResponse({
+            "success": True,
+            "categories": news_data,
+            "timestamp": get_current_timestamp(),
+            "total_categories": len(news_data)
+        })
 
     except HTTPException:
         raise
@@ -205,8 +276,9 @@ async def get_multiple_categories_news(
         )
 
 
-@app.get("/search", response_model=NewsResponse)
+@app.get("/search", responses={200: {"model": NewsResponse}})
 async def search_news(
+        request: Request,
         query: str = Query(..., min_length=3, description="Search query (minimum 3 characters)"),
         category: str = Query(default="all", description="Category to search within"),
         max_limit: int = Query(default=10, ge=1, le=50, description="Maximum number of results")
@@ -215,30 +287,56 @@ async def search_news(
         if max_limit < 1 or max_limit > 50:
             raise HTTPException(status_code=400, detail="max_limit must be between 1 and 50")
 
-        news_data = await news_api_instance.get_news(category, max_limit * 3)
+        upstream = await request.app.state.news.get_news(f"search:{query}", max_limit)
+        if upstream['success'] and upstream['data']:
+            articles = upstream['data']
+            if len(articles) > max_limit:
+                articles = articles[:max_limit]
+            articles = strip_private_fields(articles)
+            return ORJSONResponse({
+                "success": True,
+                "category": f"search:{query}",
+                "data": articles,
+                "error": None,
+                "total_articles": len(articles),
+                "timestamp": get_current_timestamp()
+            })
+
+        news_data = await request.app.state.news.get_news(category, max_limit * 3)
 
         if not news_data['success']:
             raise HTTPException(status_code=400, detail=news_data.get('error', 'Unknown error'))
 
         filtered_articles = []
         query_lower = query.lower()
-
-        for article in news_data['data']:
-            if (query_lower in article.get('title', '').lower() or
-                    query_lower in article.get('content', '').lower()):
-                filtered_articles.append(article)
-                if len(filtered_articles) >= max_limit:
-                    break
-
-        response = NewsResponse(
-            success=True,
-            category=f"search:{query}",
-            data=filtered_articles,
-            total_articles=len(filtered_articles),
-            timestamp=get_current_timestamp()
-        )
-
-        return response
+        terms = query_lower.split()
+
+        if len(terms) >= 2:
+            pattern = re.compile('|'.join(re.escape(term) for term in terms))
+            for article in news_data['data']:
+                haystack = f"{article.get('_title_lc', '')}\n{article.get('_content_lc', '')}"
+                if pattern.search(haystack):
+                    filtered_articles.append(article)
+                    if len(filtered_articles) >= max_limit:
+                        break
+        else:
+            for article in news_data['data']:
+                if (query_lower in article.get('_title_lc', '') or
+                        query_lower in article.get('_content_lc', '')):
+                    filtered_articles.append(article)
+                    if len(filtered_articles) >= max_limit:
+                        break
+
+        filtered_articles = strip_private_fields(filtered_articles)
+
+        return ORJSONResponse({
+            "success": True,
+            "category": f"search:{query}",
+            "data": filtered_articles,
+            "error": None,
+            "total_articles": len(filtered_articles),
+            "timestamp": get_current_timestamp()
+        })
 
     except HTTPException:
         raise
@@ -250,41 +348,30 @@ async def search_news(
         )
 
 
-@app.get("/trending", response_model=NewsResponse)
+@app.get("/trending", responses={200: {"model": NewsResponse}})
 async def get_trending_news(
+        request: Request,
         max_limit: int = Query(default=20, ge=1, le=100, description="Maximum number of trending articles")
 ):
-    if max_limit < 1 or max_limit > 100:
-        raise HTTPException(status_code=400, detail="max_limit must be between 1 and 100")
-    return await get_news_by_category("all", max_limit)
+    return await _fetch_and_wrap(request, "all", max_limit)
 
 
 @app.get("/stats")
 async def get_api_stats():
-    uptime = str(datetime.utcnow() - app_start_time)
+    uptime = str(datetime.now(timezone.utc) - app_start_time)
 
     return {
         "api_version": "1.0.0",
         "uptime": uptime,
         "timestamp": get_current_timestamp(),
-        "features": {
-            "async_support": True,
-            "concurrent_requests": True,
-            "multiple_categories": True,
-            "search_support": True,
-            "rate_limiting": False
-        },
-        "limits": {
-            "max_articles_per_request": 100,
-            "max_categories_per_request": 10,
-            "concurrent_request_limit": NewsConfig.MAX_CONCURRENT_REQUESTS
-        }
+        "features": API_FEATURES,
+        "limits": API_LIMITS
     }
 
 
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content=ErrorResponse(
             error="Endpoint not found",
@@ -296,7 +383,7 @@ async def not_found_handler(request, exc):
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=ErrorResponse(
             error="Internal server error",
@@ -307,5 +394,14 @@ async def internal_error_handler(request, exc):
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    import os
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=2 * (os.cpu_count() or 1) + 1,
+        access_log=False,
+        log_level="warning"
+    )
@@ -1,20 +1,34 @@
 import asyncio
 import datetime
-import uuid
-import aiohttp
-import pytz
+import hashlib
+import httpx
+import orjson
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
+from urllib.parse import quote
+from zoneinfo import ZoneInfo
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+IST = ZoneInfo('Asia/Kolkata')
+
+
+@lru_cache(maxsize=4096)
+def _fmt_minute(minute_bucket: int) -> tuple[str, str]:
+    dt = datetime.datetime.fromtimestamp(minute_bucket * 60, tz=IST)
+    return dt.strftime('%A, %d %B, %Y'), dt.strftime('%I:%M %p').lower()
+
 
 class NewsConfig:
     BASE_URL = 'https://inshorts.com/api/en'
     DEFAULT_MAX_LIMIT = 10
     REQUEST_TIMEOUT = 30
     MAX_CONCURRENT_REQUESTS = 5
+    POOL_MAX_CONNECTIONS = 100
+    POOL_KEEPALIVE_CONNECTIONS = 20
+    POOL_KEEPALIVE_EXPIRY = 75
 
     HEADERS = {
         'authority': 'inshorts.com',
@@ -34,73 +48,86 @@ class NewsConfig:
 
 
 class AsyncNewsAPI:
-    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+    def __init__(self, session: Optional[httpx.AsyncClient] = None):
         self.session = session
         self._should_close_session = session is None
-        self.ist_tz = pytz.timezone('Asia/Kolkata')
-        self.utc_tz = pytz.timezone('UTC')
+        self._inflight: Dict[tuple, asyncio.Task] = {}
 
     async def __aenter__(self):
         if self.session is None:
-            connector = aiohttp.TCPConnector(limit=NewsConfig.MAX_CONCURRENT_REQUESTS)
-            timeout = aiohttp.ClientTimeout(total=NewsConfig.REQUEST_TIMEOUT)
-            self.session = aiohttp.ClientSession(
-                connector=connector,
-                timeout=timeout,
+            limits = httpx.Limits(
+                max_connections=NewsConfig.POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=NewsConfig.POOL_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=NewsConfig.POOL_KEEPALIVE_EXPIRY
+            )
+            self.session = httpx.AsyncClient(
+                http2=True,
+                limits=limits,
+                timeout=NewsConfig.REQUEST_TIMEOUT,
                 headers=NewsConfig.HEADERS
             )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self._should_close_session and self.session:
-            await self.session.close()
+            await self.session.aclose()
 
     def _build_url(self, category: str) -> str:
         if category == 'all':
             return f'{NewsConfig.BASE_URL}/news'
+        if category.startswith('search:'):
+            term = category.split(':', 1)[1]
+            return f'{NewsConfig.BASE_URL}/search/trending_topics/{quote(term, safe="")}'
         return f'{NewsConfig.BASE_URL}/search/trending_topics/{category}'
 
-    def _build_params(self, category: str, max_limit: int = NewsConfig.DEFAULT_MAX_LIMIT) -> Dict[str, Any]:
+    def _build_params(self, category: str, max_limit: int = NewsConfig.DEFAULT_MAX_LIMIT,
+                      include_card_data: bool = False) -> Dict[str, Any]:
+        card_data = 'true' if include_card_data else 'false'
         if category == 'all':
             return {
                 'category': 'all_news',
                 'max_limit': max_limit,
-                'include_card_data': 'true'
+                'include_card_data': card_data
             }
         return {
             'category': 'top_stories',
             'max_limit': max_limit,
-            'include_card_data': 'true'
+            'include_card_data': card_data
         }
 
     def _convert_timestamp(self, timestamp: int) -> tuple[str, str]:
         try:
-            dt_utc = datetime.datetime.utcfromtimestamp(timestamp / 1000)
-            dt_utc = self.utc_tz.localize(dt_utc)
-            dt_ist = dt_utc.astimezone(self.ist_tz)
-
-            date = dt_ist.strftime('%A, %d %B, %Y')
-            time = dt_ist.strftime('%I:%M %p').lower()
-            return date, time
+            return _fmt_minute(timestamp // 60000)
         except Exception as e:
             logger.warning(f"Error converting timestamp {timestamp}: {e}")
             return "Unknown", "Unknown"
 
+    def _news_item_id(self, news: Dict[str, Any]) -> str:
+        hash_id = news.get('hash_id')
+        if hash_id:
+            return hash_id
+        seed = f"{news.get('shortened_url', '')}{news.get('created_at', 0)}"
+        return hashlib.blake2b(seed.encode(), digest_size=8).hexdigest()
+
     def _parse_news_item(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
             news = entry['news_obj']
             date, time = self._convert_timestamp(news['created_at'])
+            title = news.get('title', '')
+            content = news.get('content', '')
 
             return {
-                'id': uuid.uuid4().hex,
-                'title': news.get('title', ''),
+                'id': self._news_item_id(news),
+                'title': title,
                 'imageUrl': news.get('image_url', ''),
                 'url': news.get('shortened_url', ''),
-                'content': news.get('content', ''),
+                'content': content,
                 'author': news.get('author_name', ''),
                 'date': date,
                 'time': time,
-                'readMoreUrl': news.get('source_url', '')
+                'readMoreUrl': news.get('source_url', ''),
+                '_title_lc': title.lower(),
+                '_content_lc': content.lower()
             }
         except KeyError as e:
             logger.warning(f"Missing key in news entry: {e}")
@@ -115,14 +142,16 @@ class AsyncNewsAPI:
         params = self._build_params(category, max_limit)
 
         try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('data', {}).get('news_list', [])
-                else:
-                    logger.error(f"HTTP {response.status}: {await response.text()}")
-                    return None
-        except asyncio.TimeoutError:
+            response = await self.session.get(url, params=params)
+            if response.status_code != 200:
+                logger.error(f"HTTP {response.status_code}: {response.text}")
+                return None
+
+            payload = orjson.loads(response.content)
+            news_list = payload.get('data', {}).get('news_list', [])
+            del payload, response
+            return news_list
+        except httpx.TimeoutException:
             logger.error(f"Timeout fetching news for category: {category}")
             return None
         except Exception as e:
@@ -130,6 +159,22 @@ class AsyncNewsAPI:
             return None
 
     async def get_news(self, category: str, max_limit: int = NewsConfig.DEFAULT_MAX_LIMIT) -> Dict[str, Any]:
+        key = (category, max_limit)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._do_get_news(category, max_limit))
+            self._inflight[key] = task
+
+            def _cleanup(done: asyncio.Task, key=key):
+                self._inflight.pop(key, None)
+                if not done.cancelled():
+                    done.exception()
+
+            task.add_done_callback(_cleanup)
+
+        return await asyncio.shield(task)
+
+    async def _do_get_news(self, category: str, max_limit: int = NewsConfig.DEFAULT_MAX_LIMIT) -> Dict[str, Any]:
         news_dictionary = {
             'success': True,
             'category': category,
@@ -145,16 +190,10 @@ class AsyncNewsAPI:
             })
             return news_dictionary
 
-        tasks = [asyncio.create_task(asyncio.to_thread(self._parse_news_item, entry))
-                 for entry in news_data]
-
-        parsed_items = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for item in parsed_items:
-            if isinstance(item, dict) and item is not None:
-                news_dictionary['data'].append(item)
-            elif isinstance(item, Exception):
-                logger.warning(f"Error parsing news item: {item}")
+        news_dictionary['data'] = [
+            item for item in (self._parse_news_item(entry) for entry in news_data)
+            if item is not None
+        ]
 
         return news_dictionary
 